@@ -13,12 +13,23 @@ Requirements:
 
 Usage:
     py examples/vscode_llm_example.py
+    py examples/vscode_llm_example.py --cache-ttl 600
+    py examples/vscode_llm_example.py --refresh
+    py examples/vscode_llm_example.py --no-cache
 """
 
 import asyncio
 import aiohttp
-import json
+import argparse
+import dbm
+import hashlib
+import orjson
 import os
+import random
+import re
+import threading
+import time
+from typing import AsyncIterator, Optional
 from anthropic import AsyncAnthropic
 
 
@@ -26,6 +37,21 @@ from anthropic import AsyncAnthropic
 VSCODE_MAX_RETRIES = 3
 VSCODE_LLM_FALLBACK_ENABLED = os.getenv('VSCODE_LLM_FALLBACK', 'true').lower() == 'true'
 
+# Proxy endpoints, resolved once at import.
+# Call reload_config() after changing VSCODE_LLM_ENDPOINT at runtime.
+_ENDPOINT = ''
+_BASE_URL = ''
+
+
+def reload_config():
+    """Resolve the proxy endpoints from the environment."""
+    global _ENDPOINT, _BASE_URL
+    _ENDPOINT = os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080/v1/chat/completions')
+    _BASE_URL = _ENDPOINT.rsplit('/v1/', 1)[0]
+
+
+reload_config()
+
 
 class VSCodeLLMError(Exception):
     """Base exception for VS Code LLM errors."""
@@ -57,23 +83,220 @@ class PayloadTooLargeError(VSCodeLLMError):
 VSCODE_PAYLOAD_LIMIT_KB = 100
 VSCODE_PAYLOAD_LIMIT_BYTES = VSCODE_PAYLOAD_LIMIT_KB * 1024
 
+# Matches content-filter errors in a raw response body without decoding it
+_FILTERED_RE = re.compile(rb'filtered', re.IGNORECASE)
+
+# Two-tier response cache for deterministic (temperature 0) requests.
+# Memory: (model, system_prompt, prompt, temperature, max_tokens) -> (monotonic timestamp, content)
+# Disk: a dbm file under VSCODE_CACHE_DIR that survives restarts, so repeat runs
+# don't need the proxy. Entries are JSON (never pickles, so a cache directory
+# from an untrusted checkout can't run code) and record when and where they
+# were produced.
+VSCODE_CACHE_TTL = 3600  # seconds
+VSCODE_CACHE_DIR = os.getenv('VSCODE_LLM_CACHE_DIR', '.llm_cache')
+_response_cache: dict[tuple, tuple[float, str]] = {}
+_cache_ttl = VSCODE_CACHE_TTL
+_cache_refresh = False
+_disk_lock = threading.Lock()  # dbm files don't support concurrent access
+
+# Shared session, created on first use so every request reuses pooled connections
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            # Fail fast when the proxy is down, but allow long generations
+            timeout=aiohttp.ClientTimeout(total=120, sock_connect=5),
+            connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=75)
+        )
+    return _session
+
+
+# Shared Anthropic client for the fallback path, created on first use
+_anthropic_client: Optional[AsyncAnthropic] = None
+
+
+def _get_anthropic(api_key: str) -> AsyncAnthropic:
+    """Return the shared Anthropic client, creating it on first use."""
+    global _anthropic_client
+    if _anthropic_client is None:
+        _anthropic_client = AsyncAnthropic(api_key=api_key)
+    return _anthropic_client
+
+
+async def close_session():
+    """Close the shared session and Anthropic client. Call before the event loop shuts down."""
+    global _session, _anthropic_client
+    if _session is not None:
+        await _session.close()
+        _session = None
+    if _anthropic_client is not None:
+        await _anthropic_client.close()
+        _anthropic_client = None
+
+
+async def warmup():
+    """
+    Open a pooled connection to the proxy before the first real request.
+
+    Failures are ignored; the real request reports them with retries.
+    """
+    try:
+        session = await get_session()
+        async with session.get(f"{_BASE_URL}/health") as response:
+            await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        pass
+
+
+def encode_payload(payload: dict) -> bytes:
+    """
+    Encode a request payload and check its size - VS Code proxy has ~160KB limit.
+
+    Returns:
+        The UTF-8 JSON request body, ready to send
+
+    Raises:
+        PayloadTooLargeError: If the payload exceeds VSCODE_PAYLOAD_LIMIT_BYTES
+    """
+    body = orjson.dumps(payload)
+    payload_size = len(body)
+    if payload_size > VSCODE_PAYLOAD_LIMIT_BYTES:
+        raise PayloadTooLargeError(
+            f"Payload size ({payload_size // 1024}KB) exceeds VS Code proxy limit ({VSCODE_PAYLOAD_LIMIT_KB}KB). "
+            f"Use Anthropic API for large prompts."
+        )
+    return body
+
+
+async def configure_cache(ttl: float = VSCODE_CACHE_TTL, refresh: bool = False):
+    """
+    Set the default response cache policy and evict expired disk entries.
+
+    Args:
+        ttl: Seconds a cached response stays valid (0 disables caching)
+        refresh: Ignore cached responses but still store new ones
+    """
+    global _cache_ttl, _cache_refresh
+    _cache_ttl = ttl
+    _cache_refresh = refresh
+    if ttl > 0:
+        try:
+            await asyncio.to_thread(_disk_cache_evict, ttl)
+        except (OSError, *dbm.error) as e:
+            print(f"  [WARN] Disk cache unavailable: {e}")
+
+
+def _disk_key(cache_key: tuple) -> str:
+    """dbm keys must be strings or bytes; hash the cache key tuple."""
+    return hashlib.sha256(repr(cache_key).encode('utf-8')).hexdigest()
+
+
+def _open_db():
+    """Open (creating if needed) the disk cache database."""
+    os.makedirs(VSCODE_CACHE_DIR, exist_ok=True)
+    return dbm.open(os.path.join(VSCODE_CACHE_DIR, 'responses'), 'c')
+
+
+def _decode_entry(raw: Optional[bytes]) -> Optional[dict]:
+    """Decode a stored entry; anything unreadable counts as a miss."""
+    if raw is None:
+        return None
+    try:
+        entry = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    return entry if isinstance(entry, dict) and 'timestamp' in entry else None
+
+
+def _disk_cache_get(cache_key: tuple, ttl: float) -> Optional[dict]:
+    """Return a fresh disk cache entry, or None."""
+    with _disk_lock, _open_db() as db:
+        entry = _decode_entry(db.get(_disk_key(cache_key)))
+    if entry and time.time() - entry['timestamp'] < ttl:
+        return entry
+    return None
+
+
+def _disk_cache_set(cache_key: tuple, content: str):
+    """Store a response with its metadata in the disk cache."""
+    entry = {
+        "response": content,
+        "timestamp": time.time(),
+        "model": cache_key[0],
+        "endpoint": _ENDPOINT
+    }
+    with _disk_lock, _open_db() as db:
+        db[_disk_key(cache_key)] = orjson.dumps(entry)
+
+
+def _disk_cache_evict(ttl: float):
+    """Remove disk cache entries older than ttl seconds."""
+    now = time.time()
+    with _disk_lock, _open_db() as db:
+        expired = []
+        for key in db.keys():
+            entry = _decode_entry(db[key])
+            if entry is None or now - entry['timestamp'] >= ttl:
+                expired.append(key)
+        for key in expired:
+            del db[key]
+
+
+async def _cache_lookup(cache_key: tuple, ttl: float) -> Optional[str]:
+    """Look up a response in memory, then on disk. Disk hits are promoted to memory."""
+    cached = _response_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        print("  [OK] VS Code LLM cache hit")
+        return cached[1]
+
+    try:
+        entry = await asyncio.to_thread(_disk_cache_get, cache_key, ttl)
+    except (OSError, *dbm.error) as e:
+        print(f"  [WARN] Disk cache unavailable: {e}")
+        return None
+    if entry:
+        print("  [OK] VS Code LLM disk cache hit")
+        age = time.time() - entry['timestamp']
+        _response_cache[cache_key] = (time.monotonic() - age, entry['response'])
+        return entry['response']
+    return None
+
+
+async def _cache_store(cache_key: tuple, content: str):
+    """Store a response in memory and on disk."""
+    _response_cache[cache_key] = (time.monotonic(), content)
+    try:
+        await asyncio.to_thread(_disk_cache_set, cache_key, content)
+    except (OSError, *dbm.error) as e:
+        print(f"  [WARN] Disk cache unavailable: {e}")
+
 
 async def call_vscode_llm(
     prompt: str,
     system_prompt: str = "You are a helpful assistant.",
     model: str = "claude-3-5-sonnet",
     temperature: float = 0.7,
-    max_tokens: int = 1000
+    max_tokens: int = 1000,
+    cache_ttl: Optional[float] = None
 ) -> str:
     """
     Make a call to VS Code's LLM API with retry logic.
 
+    Responses to temperature 0 requests are cached in memory and on disk for
+    cache_ttl seconds; sampled (temperature > 0) requests always go to the proxy.
+
     Args:
         prompt: The user's message
         system_prompt: System instructions for the model
         model: Model to use (default: claude-3-5-sonnet)
         temperature: Sampling temperature (0-1)
         max_tokens: Maximum tokens to generate
+        cache_ttl: Seconds a cached response stays valid (0 disables caching,
+            None uses the configure_cache() setting)
 
     Returns:
         The model's response text
@@ -81,7 +304,18 @@ async def call_vscode_llm(
     Raises:
         VSCodeLLMError: If all retries fail
     """
-    endpoint = os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080/v1/chat/completions')
+    endpoint = _ENDPOINT
+
+    if cache_ttl is None:
+        cache_ttl = _cache_ttl
+
+    cache_key = None
+    if temperature == 0 and cache_ttl > 0:
+        cache_key = (model, system_prompt, prompt, round(temperature, 2), max_tokens)
+        if not _cache_refresh:
+            cached = await _cache_lookup(cache_key, cache_ttl)
+            if cached is not None:
+                return cached
 
     payload = {
         "model": model,
@@ -93,59 +327,61 @@ async def call_vscode_llm(
         "max_tokens": max_tokens
     }
 
-    # Check payload size before sending - VS Code proxy has ~160KB limit
-    payload_json = json.dumps(payload)
-    payload_size = len(payload_json.encode('utf-8'))
-    if payload_size > VSCODE_PAYLOAD_LIMIT_BYTES:
-        raise PayloadTooLargeError(
-            f"Payload size ({payload_size // 1024}KB) exceeds VS Code proxy limit ({VSCODE_PAYLOAD_LIMIT_KB}KB). "
-            f"Use Anthropic API for large prompts."
-        )
+    body = encode_payload(payload)
 
     print(f"Calling VS Code LLM at {endpoint}...")
     print(f"Prompt: {prompt[:80]}{'...' if len(prompt) > 80 else ''}")
-    print(f"Payload size: {payload_size // 1024}KB")
+    print(f"Payload size: {len(body) // 1024}KB")
 
     last_error = None
 
+    session = await get_session()
+
     for attempt in range(VSCODE_MAX_RETRIES):
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    endpoint,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=aiohttp.ClientTimeout(total=120)
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        if 'filtered' in error_text.lower():
-                            raise ContentFilteredError(f"Content filtered: {error_text}")
-                        raise VSCodeLLMError(f"API error ({response.status}): {error_text}")
-
-                    data = await response.json()
-
-                    if not data.get('choices'):
-                        raise EmptyResponseError("No choices in response")
-
-                    content = data['choices'][0]['message']['content']
-                    if not content:
-                        raise EmptyResponseError("Empty content in response")
-
-                    # Success!
-                    usage = data.get('usage', {})
-                    print(f"  [OK] VS Code LLM success (attempt {attempt + 1})")
-                    if usage:
-                        print(f"    Tokens - Input: {usage.get('prompt_tokens', '?')}, "
-                              f"Output: {usage.get('completion_tokens', '?')}")
-
-                    return content
-
-        except aiohttp.ClientError as e:
-            last_error = VSCodeLLMConnectionError(f"Connection error: {e}")
-            print(f"  [FAIL] Connection error (attempt {attempt + 1}): {e}")
-
-        except (ContentFilteredError, EmptyResponseError) as e:
+            async with session.post(
+                endpoint,
+                data=body,
+                headers={"Content-Type": "application/json"}
+            ) as response:
+                if response.status != 200:
+                    error_body = await response.read()
+                    if _FILTERED_RE.search(error_body):
+                        raise ContentFilteredError(f"Content filtered: {error_body.decode(errors='replace')}")
+                    raise VSCodeLLMError(f"API error ({response.status}): {error_body.decode(errors='replace')}")
+
+                data = orjson.loads(await response.read())
+
+                if not data.get('choices'):
+                    raise EmptyResponseError("No choices in response")
+
+                content = data['choices'][0]['message']['content']
+                if not content:
+                    raise EmptyResponseError("Empty content in response")
+
+                # Success!
+                usage = data.get('usage', {})
+                print(f"  [OK] VS Code LLM success (attempt {attempt + 1})")
+                if usage:
+                    print(f"    Tokens - Input: {usage.get('prompt_tokens', '?')}, "
+                          f"Output: {usage.get('completion_tokens', '?')}")
+
+                if cache_key:
+                    await _cache_store(cache_key, content)
+
+                return content
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            reason = str(e) or type(e).__name__  # TimeoutError has no message
+            last_error = VSCodeLLMConnectionError(f"Connection error: {reason}")
+            print(f"  [FAIL] Connection error (attempt {attempt + 1}): {reason}")
+
+        except ContentFilteredError as e:
+            # Content filters are deterministic - retrying won't help
+            print(f"  [FAIL] {type(e).__name__} (attempt {attempt + 1}): {e}")
+            raise
+
+        except EmptyResponseError as e:
             last_error = e
             print(f"  [FAIL] {type(e).__name__} (attempt {attempt + 1}): {e}")
 
@@ -153,16 +389,111 @@ async def call_vscode_llm(
             last_error = e
             print(f"  [FAIL] VS Code LLM error (attempt {attempt + 1}): {e}")
 
-        # Exponential backoff before retry
+        # Jittered exponential backoff before retry (full jitter, capped at 8s)
         if attempt < VSCODE_MAX_RETRIES - 1:
-            wait_time = 2 ** (attempt + 1)  # 2, 4, 8 seconds
-            print(f"    Retrying in {wait_time}s...")
+            wait_time = random.uniform(0, min(8, 0.25 * 2 ** attempt))
+            print(f"    Retrying in {wait_time:.2f}s...")
             await asyncio.sleep(wait_time)
 
     # All retries exhausted
     raise last_error or VSCodeLLMError("All retries failed")
 
 
+async def stream_vscode_llm(
+    prompt: str,
+    system_prompt: str = "You are a helpful assistant.",
+    model: str = "claude-3-5-sonnet",
+    temperature: float = 0.7,
+    max_tokens: int = 1000
+) -> AsyncIterator[str]:
+    """
+    Stream a response from VS Code's LLM API, yielding text as it arrives.
+
+    There is no retry or caching here: once text has been yielded, a failed
+    request cannot be replayed transparently. Use collect_stream() to join
+    the chunks into a single string.
+
+    Args:
+        prompt: The user's message
+        system_prompt: System instructions for the model
+        model: Model to use (default: claude-3-5-sonnet)
+        temperature: Sampling temperature (0-1)
+        max_tokens: Maximum tokens to generate
+
+    Yields:
+        Chunks of the model's response text
+
+    Raises:
+        VSCodeLLMError: If the request fails, the proxy reports an error
+            mid-stream, or no content is returned
+        VSCodeLLMConnectionError: If the stream ends before [DONE]
+    """
+    endpoint = _ENDPOINT
+
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": True
+    }
+    body = encode_payload(payload)
+
+    received = False
+    session = await get_session()
+    try:
+        async with session.post(
+            endpoint,
+            data=body,
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            if response.status != 200:
+                error_body = await response.read()
+                if _FILTERED_RE.search(error_body):
+                    raise ContentFilteredError(f"Content filtered: {error_body.decode(errors='replace')}")
+                raise VSCodeLLMError(f"API error ({response.status}): {error_body.decode(errors='replace')}")
+
+            # Server-sent events: one "data: {...}" line per chunk, then "data: [DONE]".
+            # A failed stream ends with a "data: {"error": {...}}" chunk instead.
+            done = False
+            async for line in response.content:
+                if not line.startswith(b'data: '):
+                    continue
+                data = line[6:].strip()
+                if data == b'[DONE]':
+                    done = True
+                    break
+                chunk = orjson.loads(data)
+                if 'error' in chunk:
+                    message = chunk['error'].get('message', 'Unknown error')
+                    if _FILTERED_RE.search(message.encode()):
+                        raise ContentFilteredError(f"Content filtered: {message}")
+                    raise VSCodeLLMError(f"Stream error: {message}")
+                for choice in chunk.get('choices', []):
+                    text = choice.get('delta', {}).get('content')
+                    if text:
+                        received = True
+                        yield text
+
+            if not done:
+                raise VSCodeLLMConnectionError("Stream ended before [DONE]")
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        reason = str(e) or type(e).__name__
+        raise VSCodeLLMConnectionError(f"Connection error: {reason}") from e
+
+    if not received:
+        raise EmptyResponseError("Empty content in response")
+
+
+async def collect_stream(stream: AsyncIterator[str]) -> str:
+    """Join a streamed response into a single string."""
+    return ''.join([chunk async for chunk in stream])
+
+
 async def call_anthropic_fallback(
     prompt: str,
     system_prompt: str = "You are a helpful assistant.",
@@ -190,7 +521,7 @@ async def call_anthropic_fallback(
     print(f"  --> Falling back to Anthropic API...")
     print(f"    Model: {model}")
 
-    client = AsyncAnthropic(api_key=api_key)
+    client = _get_anthropic(api_key)
 
     response = await client.messages.create(
         model=model,
@@ -285,8 +616,44 @@ async def call_llm_with_fallback(
         )
 
 
-async def main():
-    """Run example prompts demonstrating retry and fallback."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
+    parser = argparse.ArgumentParser(
+        description="VS Code LLM example with retry and Anthropic fallback"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the response cache'
+    )
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=VSCODE_CACHE_TTL,
+        help=f'Seconds a cached response stays valid (default: {VSCODE_CACHE_TTL})'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignore cached responses but store new ones'
+    )
+    return parser
+
+
+# Built once at import so repeated main() calls don't rebuild it
+_parser = _build_parser()
+
+
+async def main(argv: Optional[list] = None):
+    """
+    Run example prompts demonstrating retry and fallback.
+
+    Args:
+        argv: Arguments to parse instead of sys.argv[1:] (for embedding)
+    """
+
+    args = _parser.parse_args(argv)
+    await configure_cache(ttl=0 if args.no_cache else args.cache_ttl, refresh=args.refresh)
 
     print("\n" + "=" * 70)
     print("VS CODE LLM EXAMPLE WITH RETRY AND ANTHROPIC FALLBACK")
@@ -294,53 +661,75 @@ async def main():
 
     # Show configuration
     print(f"\nConfiguration:")
-    print(f"  VS Code Endpoint: {os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080/v1/chat/completions')}")
+    print(f"  VS Code Endpoint: {_ENDPOINT}")
     print(f"  Max Retries: {VSCODE_MAX_RETRIES}")
     print(f"  Fallback Enabled: {VSCODE_LLM_FALLBACK_ENABLED}")
     print(f"  Anthropic API Key: {'Set' if os.getenv('ANTHROPIC_API_KEY') else 'Not set'}")
+    print(f"  Response Cache: {f'{_cache_ttl:g}s TTL in {VSCODE_CACHE_DIR}' if _cache_ttl > 0 else 'Disabled'}")
 
-    # Example 1: Normal call (should succeed on VS Code LLM)
-    print("\n" + "-" * 70)
-    print("EXAMPLE 1: Simple Question")
-    print("-" * 70)
+    await warmup()
 
-    try:
-        response = await call_llm_with_fallback(
+    # Examples 1 and 2 are independent, so run them concurrently.
+    # Example 1 is a normal call (should succeed on VS Code LLM),
+    # Example 2 is code generation.
+    results = await asyncio.gather(
+        call_llm_with_fallback(
             prompt="What is 2 + 2? Answer in one word.",
-            system_prompt="You are a helpful assistant. Be concise."
-        )
-        print(f"\nResponse: {response}")
-    except Exception as e:
-        print(f"\nFailed: {e}")
+            system_prompt="You are a helpful assistant. Be concise.",
+            temperature=0
+        ),
+        call_llm_with_fallback(
+            prompt="Write a one-line Python lambda that squares a number.",
+            system_prompt="You are a Python expert. Give only the code, no explanation.",
+            max_tokens=100
+        ),
+        return_exceptions=True
+    )
+
+    for title, result in zip(["EXAMPLE 1: Simple Question", "EXAMPLE 2: Code Generation"], results):
+        print("\n" + "-" * 70)
+        print(title)
+        print("-" * 70)
+
+        if isinstance(result, Exception):
+            print(f"\nFailed: {result}")
+        else:
+            print(f"\nResponse: {result}")
+
+    if isinstance(results[0], Exception):
         print("\nMake sure:")
         print("  1. VS Code is running with GitHub Copilot")
         print("  2. The LLM proxy server is running at 127.0.0.1:8080")
         print("  3. Set ANTHROPIC_API_KEY for fallback support")
+        await close_session()
         return
 
-    # Example 2: Code generation
+    # Example 3: Streaming (text is printed as it arrives)
     print("\n" + "-" * 70)
-    print("EXAMPLE 2: Code Generation")
+    print("EXAMPLE 3: Streaming Response")
     print("-" * 70)
 
     try:
-        response = await call_llm_with_fallback(
-            prompt="Write a one-line Python lambda that squares a number.",
-            system_prompt="You are a Python expert. Give only the code, no explanation.",
+        print("\nResponse: ", end="", flush=True)
+        async for text in stream_vscode_llm(
+            prompt="Name three planets, one per line.",
+            system_prompt="You are a helpful assistant. Be concise.",
             max_tokens=100
-        )
-        print(f"\nResponse: {response}")
+        ):
+            print(text, end="", flush=True)
+        print()
     except Exception as e:
         print(f"\nFailed: {e}")
 
-    # Example 3: Test fallback (optional - uncomment to force fallback)
+    # Example 4: Test fallback (optional - uncomment to force fallback)
     # print("\n" + "-" * 70)
-    # print("EXAMPLE 3: Force Fallback Test")
+    # print("EXAMPLE 4: Force Fallback Test")
     # print("-" * 70)
     #
     # # Temporarily set bad endpoint to force fallback
     # original_endpoint = os.getenv('VSCODE_LLM_ENDPOINT', '')
     # os.environ['VSCODE_LLM_ENDPOINT'] = 'http://127.0.0.1:9999/bad'
+    # reload_config()
     #
     # try:
     #     response = await call_llm_with_fallback(
@@ -355,6 +744,9 @@ async def main():
     #         os.environ['VSCODE_LLM_ENDPOINT'] = original_endpoint
     #     else:
     #         os.environ.pop('VSCODE_LLM_ENDPOINT', None)
+    #     reload_config()
+
+    await close_session()
 
     print("\n" + "=" * 70)
     print("DONE")
@@ -362,4 +754,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # Optional faster event loop (not available on Windows)
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
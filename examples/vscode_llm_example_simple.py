@@ -19,128 +19,590 @@ Usage:
 
 import asyncio
 import aiohttp
+import dbm
+import hashlib
+import importlib.util
+import logging
+import msgspec
+import orjson
 import os
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import AsyncIterator, Optional, Union
 
 
-async def call_vscode_llm(
+# Per-request status lines are logged at DEBUG; set LOGLEVEL=DEBUG to see them
+log = logging.getLogger("vscode_llm")
+
+# Proxy endpoint, resolved once at import.
+# Call reload_config() after changing VSCODE_LLM_ENDPOINT at runtime.
+_ENDPOINT = ''
+_HEADERS = {"Content-Type": "application/json"}
+
+
+def reload_config():
+    """Resolve the proxy endpoint from the environment."""
+    global _ENDPOINT
+    _ENDPOINT = os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080/v1/chat/completions')
+
+
+reload_config()
+
+
+# Response shapes, decoded in one pass by msgspec instead of walking dicts.
+# Unknown fields are ignored; a missing or mistyped field raises DecodeError.
+class Usage(msgspec.Struct):
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+class Message(msgspec.Struct):
+    content: Optional[str] = None
+
+
+class Choice(msgspec.Struct):
+    message: Message
+
+
+class ChatResponse(msgspec.Struct):
+    choices: list[Choice]
+    usage: Optional[Usage] = None
+
+
+class Delta(msgspec.Struct):
+    content: Optional[str] = None
+
+
+class StreamChoice(msgspec.Struct):
+    delta: Delta
+
+
+class StreamError(msgspec.Struct):
+    message: str = "Unknown error"
+
+
+class StreamChunk(msgspec.Struct):
+    choices: list[StreamChoice] = []
+    error: Optional[StreamError] = None  # Sent in place of [DONE] when a stream fails
+
+
+_response_decoder = msgspec.json.Decoder(ChatResponse)
+_chunk_decoder = msgspec.json.Decoder(StreamChunk)
+
+
+# On-disk cache for temperature 0 responses, so re-running the script doesn't
+# repeat identical requests. Maps blake2b(payload) -> JSON [timestamp, content];
+# values are never unpickled, so an untrusted cache directory can't run code.
+CACHE_DIR = os.getenv('VSCODE_LLM_CACHE_DIR', '.llm_cache')
+CACHE_TTL = 86400  # seconds
+_cache_lock = threading.Lock()  # dbm files don't support concurrent access
+
+
+def _open_cache():
+    """Open (creating if needed) the response cache database."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return dbm.open(os.path.join(CACHE_DIR, 'simple'), 'c')
+
+
+def _decode_entry(raw: Optional[bytes]) -> Optional[tuple]:
+    """Decode a stored (timestamp, content) entry; anything unreadable counts as a miss."""
+    if raw is None:
+        return None
+    try:
+        timestamp, content = orjson.loads(raw)
+    except (orjson.JSONDecodeError, TypeError, ValueError):
+        return None  # Unreadable entry (e.g. from an older cache format)
+    return timestamp, content
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """Return a cached response younger than CACHE_TTL, or None."""
+    with _cache_lock, _open_cache() as db:
+        entry = _decode_entry(db.get(key))
+    if entry and time.time() - entry[0] < CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def _cache_set(key: str, content: str):
+    """Store a response in the cache."""
+    with _cache_lock, _open_cache() as db:
+        db[key] = orjson.dumps([time.time(), content])
+
+
+def _cache_evict():
+    """Remove entries older than CACHE_TTL (and unreadable ones) so the file doesn't grow forever."""
+    now = time.time()
+    with _cache_lock, _open_cache() as db:
+        expired = []
+        for key in db.keys():
+            entry = _decode_entry(db[key])
+            if entry is None or now - entry[0] >= CACHE_TTL:
+                expired.append(key)
+        for key in expired:
+            del db[key]
+
+
+# Optional in-memory semantic cache: a prompt whose embedding is close enough
+# (cosine similarity >= SEMANTIC_CACHE_THRESHOLD) to an earlier one with the same
+# model, system prompt and max_tokens reuses that response. It is lossy and
+# loads an embedding model on first use, so it is off unless
+# VSCODE_LLM_SEMANTIC_CACHE=true and sentence-transformers and faiss are
+# installed; both are imported lazily.
+SEMANTIC_CACHE_ENABLED = os.getenv('VSCODE_LLM_SEMANTIC_CACHE', 'false').lower() == 'true'
+if SEMANTIC_CACHE_ENABLED and not all(
+    importlib.util.find_spec(name) for name in ('sentence_transformers', 'faiss')
+):
+    log.warning("VSCODE_LLM_SEMANTIC_CACHE needs sentence-transformers and faiss; semantic cache disabled")
+    SEMANTIC_CACHE_ENABLED = False
+SEMANTIC_CACHE_THRESHOLD = 0.92
+_semantic_model = None
+_semantic_indexes: dict = {}  # (model, system_prompt, max_tokens) -> (faiss index, [responses])
+_semantic_lock = threading.Lock()
+
+# In-flight temperature 0 requests, keyed like the disk cache
+_INFLIGHT: dict[str, asyncio.Future] = {}
+
+
+def _semantic_lookup(scope: tuple, prompt: str):
+    """
+    Embed a prompt and search earlier prompts in the same scope.
+
+    Returns:
+        (embedding, cached response or None)
+    """
+    global _semantic_model
+    with _semantic_lock:
+        if _semantic_model is None:
+            from sentence_transformers import SentenceTransformer
+            _semantic_model = SentenceTransformer("all-MiniLM-L6-v2")
+        embedding = _semantic_model.encode([prompt], normalize_embeddings=True)
+
+        entry = _semantic_indexes.get(scope)
+        if entry and entry[0].ntotal:
+            scores, ids = entry[0].search(embedding, 1)
+            if scores[0][0] >= SEMANTIC_CACHE_THRESHOLD:
+                return embedding, entry[1][ids[0][0]]
+    return embedding, None
+
+
+def _semantic_store(scope: tuple, embedding, content: str):
+    """Add a prompt embedding and its response to the scope's index."""
+    import faiss
+    with _semantic_lock:
+        if scope not in _semantic_indexes:
+            _semantic_indexes[scope] = (faiss.IndexFlatIP(embedding.shape[1]), [])
+        index, responses = _semantic_indexes[scope]
+        index.add(embedding)
+        responses.append(content)
+
+
+# Structured prompts (lists of records, dicts) are sent as TOON rather than
+# JSON: a list of uniform records becomes a `name[N]{k1,k2}:` header plus one
+# CSV row per record, which avoids repeating every key and brace per item.
+TOON_SYSTEM_NOTE = (
+    "The user message contains data in TOON format: `name[N]{fields}:` "
+    "introduces N rows of comma-separated values in field order; "
+    "nested objects are indented `key: value` lines; "
+    "double-quoted values are always strings."
+)
+_TOON_QUOTE_CHARS = set(',:"\n\r\t[]{}')
+# Unquoted strings that would read back as a number, boolean or null
+_TOON_LITERAL_RE = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?|true|false|null')
+
+
+def _toon_scalar(value) -> str:
+    """Format a primitive value, quoting strings that would be ambiguous."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    value = str(value)
+    if (not value or value != value.strip() or value.startswith('-')
+            or _TOON_QUOTE_CHARS.intersection(value) or _TOON_LITERAL_RE.fullmatch(value)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+def _toon_key(key) -> str:
+    """Format an object key or field name, quoted by the same rules as values."""
+    return _toon_scalar(str(key))
+
+
+def _is_primitive(value) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def to_toon(obj, name: str = "data", indent: int = 0) -> str:
+    """
+    Serialize JSON-like data as TOON (Token-Oriented Object Notation).
+
+    Args:
+        obj: A dict, list or primitive value
+        name: Key the list is stored under ("" for list items)
+        indent: Current nesting depth
+
+    Returns:
+        The TOON text
+    """
+    pad = "  " * indent
+    if isinstance(obj, dict):
+        lines = []
+        for key, value in obj.items():
+            if isinstance(value, list):
+                lines.append(to_toon(value, key, indent))
+            elif isinstance(value, dict):
+                lines.append(f"{pad}{_toon_key(key)}:\n{to_toon(value, indent=indent + 1)}")
+            else:
+                lines.append(f"{pad}{_toon_key(key)}: {_toon_scalar(value)}")
+        return "\n".join(lines)
+    if isinstance(obj, list):
+        header = f"{pad}{_toon_key(name) if name else ''}[{len(obj)}]"
+        if all(_is_primitive(item) for item in obj):
+            return f"{header}: " + ",".join(_toon_scalar(item) for item in obj)
+        # Tabular form needs every item to be a flat dict with the same keys
+        if (obj and all(isinstance(item, dict) for item in obj)
+                and all(item.keys() == obj[0].keys() for item in obj)
+                and all(_is_primitive(v) for item in obj for v in item.values())):
+            # Rows follow the header's key order, whatever order each record uses
+            fields = list(obj[0])
+            rows = [f"{pad}  " + ",".join(_toon_scalar(item[key]) for key in fields) for item in obj]
+            header_fields = ",".join(_toon_key(key) for key in fields)
+            return f"{header}{{{header_fields}}}:\n" + "\n".join(rows)
+        items = []
+        for item in obj:
+            if _is_primitive(item):
+                items.append(f"{pad}  - {_toon_scalar(item)}")
+            elif isinstance(item, list):
+                items.append(f"{pad}  - " + to_toon(item, "", indent + 2).lstrip())
+            else:
+                items.append(f"{pad}  -\n{to_toon(item, indent=indent + 2)}")
+        return f"{header}:\n" + "\n".join(items)
+    return pad + _toon_scalar(obj)
+
+
+# Placeholder for the user prompt while a payload template is serialized
+_PROMPT_SENTINEL = "\x00prompt\x00"
+
+
+@lru_cache(maxsize=128)
+def _payload_template(
+    model: str,
+    system_prompt: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    stream: bool = False
+) -> tuple[bytes, bytes]:
+    """
+    Serialize the fixed part of a request payload once.
+
+    Returns:
+        (prefix, suffix) bytes to place either side of the JSON-encoded prompt
+    """
+    # The static system prompt goes first so any upstream prefix caching can
+    # reuse it; the proxy only accepts string content, so cache_control
+    # blocks can't be sent.
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": _PROMPT_SENTINEL}
+        ],
+        "temperature": temperature
+    }
+    if max_tokens is not None:
+        payload["max_tokens"] = max_tokens
+    if stream:
+        payload["stream"] = True
+    # Only numbers follow the user message, so the last match is the placeholder
+    prefix, _, suffix = orjson.dumps(payload).rpartition(orjson.dumps(_PROMPT_SENTINEL))
+    return prefix, suffix
+
+
+def encode_payload(
     prompt: str,
+    system_prompt: str,
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    stream: bool = False
+) -> bytes:
+    """Build the OpenAI-compatible request body, reusing the cached template."""
+    prefix, suffix = _payload_template(model, system_prompt, temperature, max_tokens, stream)
+    return prefix + orjson.dumps(prompt) + suffix
+
+
+async def call_vscode_llm(
+    session: aiohttp.ClientSession,
+    prompt: Union[str, list, dict],
     system_prompt: str = "You are a helpful assistant.",
     model: str = "claude-3-5-sonnet",
     temperature: float = 0.7,
-    max_tokens: int = 1000
+    max_tokens: Optional[int] = None,
+    format: str = "toon"
 ) -> str:
     """
     Make a simple call to VS Code's LLM API.
 
+    Temperature 0 responses are cached on disk for CACHE_TTL seconds, and
+    in the semantic cache when VSCODE_LLM_SEMANTIC_CACHE is enabled. Concurrent identical
+    temperature 0 calls share a single request.
+
     Args:
-        prompt: The user's message
+        session: Shared aiohttp session (reuses keep-alive connections)
+        prompt: The user's message, or structured data (list/dict) to send
         system_prompt: System instructions for the model
         model: Model to use (default: claude-3-5-sonnet)
         temperature: Sampling temperature (0-1)
-        max_tokens: Maximum tokens to generate
+        max_tokens: Maximum tokens to generate (default: the model's own limit)
+        format: How to serialize a structured prompt: "toon" or "json"
 
     Returns:
         The model's response text
     """
-    # Get endpoint from environment or use default
-    endpoint = os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080/v1/chat/completions')
+    # Serialize structured prompts; TOON needs a note so the model can read it
+    if not isinstance(prompt, str):
+        if format == "toon":
+            prompt = to_toon(prompt)
+            system_prompt = f"{system_prompt}\n\n{TOON_SYSTEM_NOTE}"
+        elif format == "json":
+            prompt = orjson.dumps(prompt).decode()
+        else:
+            raise ValueError(f"Unknown prompt format: {format!r}")
 
-    # Build the request payload (OpenAI-compatible format)
-    payload = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": temperature,
-        "max_tokens": max_tokens
-    }
+    body = encode_payload(prompt, system_prompt, model, temperature, max_tokens)
+    scope = (model, system_prompt, max_tokens)
 
-    print(f"Calling VS Code LLM at {endpoint}...")
-    print(f"Model: {model}")
-    print(f"Prompt: {prompt[:100]}{'...' if len(prompt) > 100 else ''}")
-    print("-" * 50)
+    # Only deterministic requests are cached or shared; sampled output varies per call
+    if temperature != 0:
+        return await _complete(session, body, prompt, scope, None)
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            endpoint,
-            json=payload,
-            headers={"Content-Type": "application/json"}
-        ) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                raise Exception(f"API error ({response.status}): {error_text}")
+    # Identical concurrent requests wait on the first one instead of resending it
+    cache_key = hashlib.blake2b(body).hexdigest()
+    task = _INFLIGHT.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_complete(session, body, prompt, scope, cache_key))
+        _INFLIGHT[cache_key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(cache_key, None))
+    # Shielded so one caller being cancelled doesn't cancel the shared request
+    return await asyncio.shield(task)
 
-            data = await response.json()
 
-            # Extract response content
-            if not data.get('choices'):
-                raise Exception("No choices in response")
+async def _complete(
+    session: aiohttp.ClientSession,
+    body: bytes,
+    prompt: str,
+    scope: tuple,
+    cache_key: Optional[str]
+) -> str:
+    """
+    Send a chat completion request, checking the caches first when cache_key is set.
+
+    Args:
+        session: Shared aiohttp session
+        body: Encoded request payload
+        prompt: The user's message (for the semantic cache and logging)
+        scope: (model, system_prompt, max_tokens) for the semantic cache
+        cache_key: Disk cache key, or None to bypass the caches
+
+    Returns:
+        The model's response text
+    """
+    endpoint = _ENDPOINT
+    model = scope[0]
 
-            content = data['choices'][0]['message']['content']
+    embedding = None
+    if cache_key:
+        try:
+            cached = await asyncio.to_thread(_cache_get, cache_key)
+        except (OSError, *dbm.error) as e:
+            log.warning("disk cache unavailable: %s", e)
+            cached = None
+        if cached is not None:
+            log.debug("cache hit: %.100s", prompt)
+            return cached
 
-            # Print usage info if available
-            usage = data.get('usage', {})
-            if usage:
-                print(f"Tokens - Input: {usage.get('prompt_tokens', '?')}, "
-                      f"Output: {usage.get('completion_tokens', '?')}")
+        if SEMANTIC_CACHE_ENABLED:
+            embedding, cached = await asyncio.to_thread(_semantic_lookup, scope, prompt)
+            if cached is not None:
+                log.debug("semantic cache hit: %.100s", prompt)
+                return cached
 
-            return content
+    log.debug("calling %s model=%s prompt=%.100s", endpoint, model, prompt)
+
+    async with session.post(
+        endpoint,
+        data=body,
+        headers=_HEADERS
+    ) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            raise Exception(f"API error ({response.status}): {error_text}")
+
+        try:
+            data = _response_decoder.decode(await response.read())
+        except msgspec.DecodeError as e:
+            raise Exception(f"Malformed response: {e}") from e
+
+        # Extract response content
+        if not data.choices:
+            raise Exception("No choices in response")
+
+        content = data.choices[0].message.content
+
+        # Log usage info if available
+        if data.usage:
+            log.debug("tokens input=%s output=%s",
+                      data.usage.prompt_tokens, data.usage.completion_tokens)
+
+        if cache_key:
+            try:
+                await asyncio.to_thread(_cache_set, cache_key, content)
+            except (OSError, *dbm.error) as e:
+                log.warning("disk cache unavailable: %s", e)
+        if embedding is not None:
+            await asyncio.to_thread(_semantic_store, scope, embedding, content)
+
+        return content
+
+
+async def call_vscode_llm_stream(
+    session: aiohttp.ClientSession,
+    prompt: str,
+    system_prompt: str = "You are a helpful assistant.",
+    model: str = "claude-3-5-sonnet",
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None
+) -> AsyncIterator[str]:
+    """
+    Stream a response from VS Code's LLM API, yielding text as it arrives.
+
+    Streamed responses are not cached.
+
+    Args:
+        session: Shared aiohttp session (reuses keep-alive connections)
+        prompt: The user's message
+        system_prompt: System instructions for the model
+        model: Model to use (default: claude-3-5-sonnet)
+        temperature: Sampling temperature (0-1)
+        max_tokens: Maximum tokens to generate (default: the model's own limit)
+
+    Yields:
+        Chunks of the model's response text
+    """
+    endpoint = _ENDPOINT
+    body = encode_payload(prompt, system_prompt, model, temperature, max_tokens, stream=True)
+
+    async with session.post(
+        endpoint,
+        data=body,
+        headers=_HEADERS
+    ) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            raise Exception(f"API error ({response.status}): {error_text}")
+
+        # Server-sent events: one "data: {...}" line per chunk, then "data: [DONE]"
+        async for line in response.content:
+            if not line.startswith(b'data: '):
+                continue
+            data = line[6:].strip()
+            if data == b'[DONE]':
+                return
+            chunk = _chunk_decoder.decode(data)
+            if chunk.error:
+                raise Exception(f"Stream error: {chunk.error.message}")
+            for choice in chunk.choices:
+                text = choice.delta.content
+                if text:
+                    yield text
+
+    raise Exception("Stream ended before [DONE]")
 
 
 async def main():
     """Run example prompts through VS Code LLM."""
 
-    # Example 1: Simple question
-    print("\n" + "=" * 60)
-    print("EXAMPLE 1: Simple Question")
-    print("=" * 60)
-
+    # Prune expired responses once per run
     try:
-        response = await call_vscode_llm(
-            prompt="What are the three primary colors?",
-            system_prompt="You are a helpful assistant. Give concise answers."
-        )
-        print(f"\nResponse:\n{response}")
-    except Exception as e:
-        print(f"\nError: {e}")
-        print("\nMake sure:")
-        print("  1. VS Code is running with GitHub Copilot")
-        print("  2. The LLM proxy server is running at 127.0.0.1:8080")
-        print("  3. Or set VSCODE_LLM_ENDPOINT to your proxy URL")
-        return
-
-    # Example 2: Code generation
-    print("\n" + "=" * 60)
-    print("EXAMPLE 2: Code Generation")
-    print("=" * 60)
+        await asyncio.to_thread(_cache_evict)
+    except (OSError, *dbm.error) as e:
+        log.warning("disk cache unavailable: %s", e)
 
-    try:
-        response = await call_vscode_llm(
-            prompt="Write a Python function that checks if a number is prime. Just the function, no explanation.",
-            system_prompt="You are a Python expert. Write clean, efficient code.",
-            max_tokens=500
+    # One session for all examples so requests reuse keep-alive connections
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=75)
+    ) as session:
+        # The examples are independent, so run them concurrently
+        results = await asyncio.gather(
+            # Example 1: Simple question
+            call_vscode_llm(
+                session,
+                prompt="What are the three primary colors?",
+                system_prompt="You are a helpful assistant. Give concise answers.",
+                temperature=0
+            ),
+            # Example 2: Code generation
+            call_vscode_llm(
+                session,
+                prompt="Write a Python function that checks if a number is prime. Just the function, no explanation.",
+                system_prompt="You are a Python expert. Write clean, efficient code.",
+                max_tokens=500
+            ),
+            # Example 3: Creative writing
+            call_vscode_llm(
+                session,
+                prompt="Write a haiku about programming.",
+                system_prompt="You are a creative writer.",
+                temperature=0.9,
+                max_tokens=100
+            ),
+            return_exceptions=True
         )
-        print(f"\nResponse:\n{response}")
-    except Exception as e:
-        print(f"\nError: {e}")
 
-    # Example 3: Creative writing
-    print("\n" + "=" * 60)
-    print("EXAMPLE 3: Creative Writing")
-    print("=" * 60)
+        # One write per example rather than a print (and flush) per line
+        titles = ["EXAMPLE 1: Simple Question", "EXAMPLE 2: Code Generation", "EXAMPLE 3: Creative Writing"]
+        for title, result in zip(titles, results):
+            if isinstance(result, Exception):
+                body = f"Error: {result}"
+            else:
+                body = f"Response:\n{result}"
+            sys.stdout.write(f"\n{'=' * 60}\n{title}\n{'=' * 60}\n\n{body}\n")
 
-    try:
-        response = await call_vscode_llm(
-            prompt="Write a haiku about programming.",
-            system_prompt="You are a creative writer.",
-            temperature=0.9,
-            max_tokens=100
+        # Example 4: Streaming (text is printed as it arrives)
+        sys.stdout.write(f"\n{'=' * 60}\nEXAMPLE 4: Streaming Response\n{'=' * 60}\n\nResponse:\n")
+
+        try:
+            async for text in call_vscode_llm_stream(
+                session,
+                prompt="Name three planets, one per line.",
+                system_prompt="You are a helpful assistant. Be concise.",
+                max_tokens=100
+            ):
+                print(text, end="", flush=True)
+            print()
+        except Exception as e:
+            print(f"\nError: {e}")
+
+    if isinstance(results[0], Exception):
+        sys.stdout.write(
+            "\nMake sure:\n"
+            "  1. VS Code is running with GitHub Copilot\n"
+            "  2. The LLM proxy server is running at 127.0.0.1:8080\n"
+            "  3. Or set VSCODE_LLM_ENDPOINT to your proxy URL\n"
         )
-        print(f"\nResponse:\n{response}")
-    except Exception as e:
-        print(f"\nError: {e}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    logging.basicConfig(level=os.getenv('LOGLEVEL', 'WARNING').upper())
+    try:
+        import uvloop  # Optional faster event loop (not available on Windows)
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -20,50 +20,143 @@ Usage:
 import asyncio
 import aiohttp
 import argparse
-import json
+import functools
+import orjson
 import os
+import re
+import sys
+import time
+from typing import Optional
+
+
+# Tools endpoint, resolved once at import.
+# Call reload_config() after changing VSCODE_LLM_ENDPOINT at runtime.
+_TOOLS_URL = ''
+
+
+def reload_config():
+    """Resolve the tools endpoint from the environment."""
+    global _TOOLS_URL
+    base_url = os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080')
+    # Extract base URL if full endpoint was provided
+    if '/v1/chat' in base_url:
+        base_url = base_url.rsplit('/v1/', 1)[0]
+    _TOOLS_URL = f"{base_url}/v1/tools"
+
+
+reload_config()
+
+
+# Shared session, created on first use so repeated requests reuse pooled connections
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, limit_per_host=20, keepalive_timeout=75)
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared session. Call before the event loop shuts down."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+# Tool registry cache: (timestamp, tools) for the unfiltered /v1/tools listing.
+# Registered tools rarely change, so a fresh entry is returned as-is and a
+# stale one is returned immediately while a background task refreshes it.
+# Tag and name filters are applied locally on top of the cached registry.
+TOOLS_CACHE_TTL = 10        # seconds an entry is fresh
+TOOLS_CACHE_STALE_TTL = 60  # seconds an entry may be served while refreshing
+_tools_cache: Optional[tuple[float, list]] = None
+_refresh_task: Optional[asyncio.Task] = None
 
 
 async def list_tools(
     tags: str = None,
-    name: str = None
+    name: str = None,
+    use_cache: bool = True
 ) -> list:
     """
     List available tools from VS Code.
 
+    Filters follow the proxy's /v1/tools rules: a tool must have every
+    requested tag, and the name pattern matches case-insensitively with
+    "*" as the only wildcard.
+
     Args:
         tags: Comma-separated tags to filter by (e.g., "vscode,editor")
         name: Name pattern with wildcards (e.g., "get_*")
+        use_cache: Serve from the tool registry cache when possible
 
     Returns:
         List of tool information dictionaries
     """
-    base_url = os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080')
-    # Extract base URL if full endpoint was provided
-    if '/v1/chat' in base_url:
-        base_url = base_url.rsplit('/v1/', 1)[0]
-
-    endpoint = f"{base_url}/v1/tools"
+    tools = await _get_registry(use_cache)
 
-    # Build query parameters
-    params = {}
     if tags:
-        params['tags'] = tags
+        tag_set = frozenset(t.strip() for t in tags.split(',') if t.strip())
+        tools = [t for t in tools if tag_set.issubset(t.get('tags') or ())]
     if name:
-        params['name'] = name
+        pattern = _name_pattern(name)
+        tools = [t for t in tools if pattern.fullmatch(t.get('name', ''))]
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            endpoint,
-            params=params,
-            headers={"Accept": "application/json"}
-        ) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                raise Exception(f"API error ({response.status}): {error_text}")
+    return tools
 
-            data = await response.json()
-            return data.get('data', [])
+
+@functools.lru_cache(maxsize=32)
+def _name_pattern(name: str) -> re.Pattern:
+    """Compile a "*" wildcard name pattern once per distinct pattern."""
+    return re.compile('.*'.join(re.escape(part) for part in name.split('*')), re.IGNORECASE)
+
+
+async def _get_registry(use_cache: bool = True) -> list:
+    """Return the unfiltered tool registry, from the cache when possible."""
+    global _refresh_task
+    if use_cache and _tools_cache:
+        age = time.monotonic() - _tools_cache[0]
+        if age < TOOLS_CACHE_TTL:
+            return _tools_cache[1]
+        if age < TOOLS_CACHE_STALE_TTL:
+            if _refresh_task is None:
+                _refresh_task = asyncio.create_task(_fetch_tools())
+                _refresh_task.add_done_callback(_finish_refresh)
+            return _tools_cache[1]
+
+    return await _fetch_tools()
+
+
+def _finish_refresh(task: asyncio.Task):
+    """Forget a finished background refresh; a failed one keeps the stale entry."""
+    global _refresh_task
+    _refresh_task = None
+    if not task.cancelled():
+        task.exception()
+
+
+async def _fetch_tools() -> list:
+    """Fetch the full tool registry from the proxy and cache it."""
+    global _tools_cache
+    session = await get_session()
+    async with session.get(
+        _TOOLS_URL,
+        headers={"Accept": "application/json"}
+    ) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            raise Exception(f"API error ({response.status}): {error_text}")
+
+        data = orjson.loads(await response.read())
+        tools = data.get('data', [])
+        _tools_cache = (time.monotonic(), tools)
+        return tools
 
 
 def print_tool(tool: dict, show_schema: bool = False):
@@ -90,9 +183,8 @@ def print_tool(tool: dict, show_schema: bool = False):
                 print(f"      - {prop_name}{req} ({prop_type}): {prop_desc[:50]}")
 
 
-async def main():
-    """List and explore available VS Code tools."""
-
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
     parser = argparse.ArgumentParser(
         description="List available VS Code tools"
     )
@@ -114,18 +206,39 @@ async def main():
         action='store_true',
         help='Output raw JSON'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the tool registry cache'
+    )
+    return parser
+
+
+# Built once at import so repeated main() calls don't rebuild it
+_parser = _build_parser()
 
-    args = parser.parse_args()
+
+async def main(argv: Optional[list] = None):
+    """
+    List and explore available VS Code tools.
+
+    Args:
+        argv: Arguments to parse instead of sys.argv[1:] (for embedding)
+    """
+
+    args = _parser.parse_args(argv)
 
     print("\n" + "=" * 60)
     print("VS CODE AVAILABLE TOOLS")
     print("=" * 60)
 
     try:
-        tools = await list_tools(tags=args.tags, name=args.name)
+        tools = await list_tools(tags=args.tags, name=args.name, use_cache=not args.no_cache)
 
         if args.json:
-            print(json.dumps(tools, indent=2))
+            # Write encoded bytes directly instead of building an indented str
+            sys.stdout.flush()
+            sys.stdout.buffer.write(orjson.dumps(tools, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
             return
 
         if not tools:
@@ -176,6 +289,14 @@ See vscode_llm_tools_simple.py and vscode_llm_tools_auto.py for examples.
         print("  1. VS Code is running with GitHub Copilot")
         print("  2. The LLM proxy server is running at 127.0.0.1:8080")
 
+    finally:
+        await close_session()
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # Optional faster event loop (not available on Windows)
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -16,7 +16,45 @@ Usage:
 
 import asyncio
 import aiohttp
+import orjson
 import os
+from typing import Optional
+
+
+# Proxy endpoint, resolved once at import.
+# Call reload_config() after changing VSCODE_LLM_ENDPOINT at runtime.
+_ENDPOINT = ''
+
+
+def reload_config():
+    """Resolve the proxy endpoint from the environment."""
+    global _ENDPOINT
+    _ENDPOINT = os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080/v1/chat/completions')
+
+
+reload_config()
+
+
+# Shared session, created on first use so repeated requests reuse pooled connections
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, limit_per_host=20, keepalive_timeout=75)
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared session. Call before the event loop shuts down."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
 
 
 async def chat_with_auto_tools(
@@ -45,7 +83,7 @@ async def chat_with_auto_tools(
     Returns:
         The final response content
     """
-    endpoint = os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080/v1/chat/completions')
+    endpoint = _ENDPOINT
 
     payload = {
         "model": model,
@@ -63,31 +101,31 @@ async def chat_with_auto_tools(
     print(f"  max_tool_rounds: {max_tool_rounds}")
     print("-" * 40)
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            endpoint,
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=aiohttp.ClientTimeout(total=120)  # Allow time for tool execution
-        ) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                raise Exception(f"API error ({response.status}): {error_text}")
+    session = await get_session()
+    async with session.post(
+        endpoint,
+        data=orjson.dumps(payload),
+        headers={"Content-Type": "application/json"},
+        timeout=aiohttp.ClientTimeout(total=120)  # Allow time for tool execution
+    ) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            raise Exception(f"API error ({response.status}): {error_text}")
 
-            data = await response.json()
+        data = orjson.loads(await response.read())
 
-            if not data.get('choices'):
-                raise Exception("No choices in response")
+        if not data.get('choices'):
+            raise Exception("No choices in response")
 
-            choice = data['choices'][0]
-            message = choice['message']
+        choice = data['choices'][0]
+        message = choice['message']
 
-            # In auto mode, we should get a final response (no tool_calls)
-            if message.get('tool_calls'):
-                print("Warning: Response still contains tool_calls")
-                print("This might mean max_tool_rounds was exceeded")
+        # In auto mode, we should get a final response (no tool_calls)
+        if message.get('tool_calls'):
+            print("Warning: Response still contains tool_calls")
+            print("This might mean max_tool_rounds was exceeded")
 
-            return message.get('content', '')
+        return message.get('content', '')
 
 
 async def main():
@@ -99,50 +137,44 @@ async def main():
     print("\nThis mode lets the proxy handle tool execution automatically.")
     print("You just ask a question and get the final answer.\n")
 
-    # Example 1: Simple question that might use tools
-    print("=" * 60)
-    print("EXAMPLE 1: Question that may trigger VS Code tools")
-    print("=" * 60)
-
-    try:
-        response = await chat_with_auto_tools(
+    # The examples are independent, so run them concurrently
+    results = await asyncio.gather(
+        # Example 1: Simple question that might use tools
+        chat_with_auto_tools(
             prompt="List the files in the current workspace's src folder",
             max_tool_rounds=3
-        )
-        print(f"\nResponse:\n{response}")
-    except Exception as e:
-        print(f"\nError: {e}")
-        print("\nThis is expected if no file-related tools are available.")
-        print("The available tools depend on your VS Code extensions.")
-
-    # Example 2: With custom tools (hybrid mode)
-    print("\n" + "=" * 60)
-    print("EXAMPLE 2: Agentic workflow")
-    print("=" * 60)
-
-    try:
-        response = await chat_with_auto_tools(
+        ),
+        # Example 2: With custom tools (hybrid mode)
+        chat_with_auto_tools(
             prompt="What extensions are currently installed in VS Code?",
             max_tool_rounds=5
-        )
-        print(f"\nResponse:\n{response}")
-    except Exception as e:
-        print(f"\nError: {e}")
-
-    # Example 3: Show what happens when no tools are needed
-    print("\n" + "=" * 60)
-    print("EXAMPLE 3: Question that doesn't need tools")
-    print("=" * 60)
-
-    try:
-        response = await chat_with_auto_tools(
+        ),
+        # Example 3: Show what happens when no tools are needed
+        chat_with_auto_tools(
             prompt="What is 2 + 2?",
             use_vscode_tools=True,
             max_tool_rounds=1
-        )
-        print(f"\nResponse:\n{response}")
-    except Exception as e:
-        print(f"\nError: {e}")
+        ),
+        return_exceptions=True
+    )
+
+    titles = [
+        "EXAMPLE 1: Question that may trigger VS Code tools",
+        "EXAMPLE 2: Agentic workflow",
+        "EXAMPLE 3: Question that doesn't need tools",
+    ]
+    for i, (title, result) in enumerate(zip(titles, results)):
+        print("\n" + "=" * 60)
+        print(title)
+        print("=" * 60)
+
+        if isinstance(result, Exception):
+            print(f"\nError: {result}")
+            if i == 0:
+                print("\nThis is expected if no file-related tools are available.")
+                print("The available tools depend on your VS Code extensions.")
+        else:
+            print(f"\nResponse:\n{result}")
 
     print("\n" + "=" * 60)
     print("NOTES")
@@ -155,6 +187,13 @@ async def main():
 - max_tool_rounds limits how many times the model can call tools
 """)
 
+    await close_session()
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # Optional faster event loop (not available on Windows)
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -8,6 +8,8 @@ Requirements:
 1. VS Code running with GitHub Copilot extension
 2. The proxy server running at 127.0.0.1:8080
 3. Set VSCODE_LLM_ENDPOINT if using a different port
+4. Python 3.11+ (uses asyncio.TaskGroup)
+5. orjson 3.9+ (uses orjson.Fragment)
 
 Usage:
     py examples/vscode_llm_tools_simple.py
@@ -15,8 +17,45 @@ Usage:
 
 import asyncio
 import aiohttp
-import json
+import orjson
 import os
+from typing import Optional, Union
+
+
+# Proxy endpoint, resolved once at import.
+# Call reload_config() after changing VSCODE_LLM_ENDPOINT at runtime.
+_ENDPOINT = ''
+
+
+def reload_config():
+    """Resolve the proxy endpoint from the environment."""
+    global _ENDPOINT
+    _ENDPOINT = os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080/v1/chat/completions')
+
+
+reload_config()
+
+
+# Shared session, created on first use so repeated requests reuse pooled connections
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, limit_per_host=20, keepalive_timeout=75)
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared session. Call before the event loop shuts down."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
 
 
 # Define a simple tool
@@ -44,35 +83,73 @@ WEATHER_TOOL = {
 }
 
 
-def execute_tool(name: str, arguments: dict) -> str:
+async def execute_tool(name: str, arguments: dict) -> str:
     """
     Execute a tool locally and return the result.
-    In a real application, this would call actual APIs.
+    In a real application, this would call actual APIs, so it is async
+    and independent tool calls can run concurrently.
     """
     if name == "get_weather":
         location = arguments.get("location", "Unknown")
         unit = arguments.get("unit", "celsius")
         # Simulated weather data
         temp = 22 if unit == "celsius" else 72
-        return json.dumps({
+        return orjson.dumps({
             "location": location,
             "temperature": temp,
             "unit": unit,
             "condition": "Partly cloudy",
             "humidity": 65
-        })
-    return json.dumps({"error": f"Unknown tool: {name}"})
+        }).decode()
+    return orjson.dumps({"error": f"Unknown tool: {name}"}).decode()
+
+
+# Maximum number of tool calls executed at the same time
+MAX_CONCURRENT_TOOLS = 8
+
+
+async def execute_tool_calls(tool_calls: list) -> list:
+    """
+    Execute tool calls concurrently, at most MAX_CONCURRENT_TOOLS at a time.
+
+    Runs in a TaskGroup, so if one tool fails the others are cancelled.
+    Results are returned in the same order as tool_calls.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOOLS)
+
+    async def run_one(tool_call: dict) -> str:
+        async with semaphore:
+            return await execute_tool(
+                tool_call['function']['name'],
+                orjson.loads(tool_call['function']['arguments'])
+            )
+
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(run_one(tc)) for tc in tool_calls]
+    return [task.result() for task in tasks]
+
+
+def encode_tools(tools: list) -> orjson.Fragment:
+    """
+    Encode a tools list once for reuse across requests.
+
+    The returned fragment is spliced into each payload as-is, so the tool
+    schemas are not re-serialized on every call (requires orjson >= 3.9).
+    """
+    return orjson.Fragment(orjson.dumps(tools))
 
 
 async def chat_with_tools(
     messages: list,
-    tools: list,
+    tools: Union[list, orjson.Fragment],
     model: str = "claude-3.5-sonnet"
 ) -> dict:
     """
     Send a chat request with tools and return the response.
+
+    tools may be a plain list or the pre-encoded result of encode_tools().
     """
-    endpoint = os.getenv('VSCODE_LLM_ENDPOINT', 'http://127.0.0.1:8080/v1/chat/completions')
+    endpoint = _ENDPOINT
 
     payload = {
         "model": model,
@@ -80,16 +157,16 @@ async def chat_with_tools(
         "tools": tools
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            endpoint,
-            json=payload,
-            headers={"Content-Type": "application/json"}
-        ) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                raise Exception(f"API error ({response.status}): {error_text}")
-            return await response.json()
+    session = await get_session()
+    async with session.post(
+        endpoint,
+        data=orjson.dumps(payload),
+        headers={"Content-Type": "application/json"}
+    ) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            raise Exception(f"API error ({response.status}): {error_text}")
+        return orjson.loads(await response.read())
 
 
 async def main():
@@ -103,7 +180,7 @@ async def main():
     messages = [
         {"role": "user", "content": "What's the weather like in London?"}
     ]
-    tools = [WEATHER_TOOL]
+    tools = encode_tools([WEATHER_TOOL])  # Sent twice below, so encode once
 
     print(f"\nUser: {messages[0]['content']}")
     print("-" * 40)
@@ -124,25 +201,21 @@ async def main():
             tool_calls = message['tool_calls']
             print(f"\nStep 2: Model requested {len(tool_calls)} tool call(s)")
 
-            # Add assistant message with tool calls to conversation
-            messages.append(message)
-
-            # Step 3: Execute each tool and add results
+            # Step 3: Execute the tools concurrently
             for tool_call in tool_calls:
-                tool_name = tool_call['function']['name']
-                tool_args = json.loads(tool_call['function']['arguments'])
-                tool_id = tool_call['id']
+                print(f"\n  Executing: {tool_call['function']['name']}({tool_call['function']['arguments']})")
 
-                print(f"\n  Executing: {tool_name}({tool_args})")
-                result = execute_tool(tool_name, tool_args)
+            results = await execute_tool_calls(tool_calls)
+
+            for result in results:
                 print(f"  Result: {result}")
 
-                # Add tool result to conversation
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_id,
-                    "content": result
-                })
+            # Add assistant message with tool calls and the tool results to conversation
+            messages.extend([
+                message,
+                *[{"role": "tool", "tool_call_id": tc['id'], "content": result}
+                  for tc, result in zip(tool_calls, results)]
+            ])
 
             # Step 4: Send follow-up request with tool results
             print("\nStep 3: Sending tool results back to model...")
@@ -162,6 +235,14 @@ async def main():
         print("  2. The LLM proxy server is running at 127.0.0.1:8080")
         print("  3. Tool calling is supported by the model")
 
+    finally:
+        await close_session()
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # Optional faster event loop (not available on Windows)
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())